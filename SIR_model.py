@@ -5,9 +5,10 @@ Description: Baseline model for this problem, this file also runs a bunch of sim
 and reports the average number of infected in the model
 """
 import numpy as np
-import matplotlib.pyplot as plt
+from rng import as_random_source
+import reporting
 
-def stochastic_sir(N, I0, R0, beta, gamma, days):
+def stochastic_sir(N, I0, R0, beta, gamma, days, rng=None):
     S = np.zeros(days, dtype=int)
     I = np.zeros(days, dtype=int)
     R = np.zeros(days, dtype=int)
@@ -15,7 +16,7 @@ def stochastic_sir(N, I0, R0, beta, gamma, days):
     I[0] = I0
     R[0] = R0
     
-    rng = np.random.default_rng()
+    rng = as_random_source(rng)
 
     for t in range(1, days):
         if I[t-1] == 0:
@@ -40,28 +41,62 @@ R0 = 0
 beta = 0.3 # This number represents the transmission probability
 gamma = 0.1 # This number represents the recovery rate
 days = 100
+SEED = None # Set to an integer to reproduce the same runs
 
-peak_infected = []
+def run_study(n_runs, N, I0, R0, beta, gamma, days, rng=None):
+    """
+    Runs the stochastic SIR model n_runs times and returns the peak number of infected
+    for every run where the disease took off
+    """
+    peak_infected = []
 
-for _ in range(N_RUNS):
-    S, I, R = stochastic_sir(N, I0, R0, beta, gamma, days)
-    peak = max(I)
-    if peak <= 5:
-        continue
-    peak_infected.append(peak)
+    for run_rng in as_random_source(rng).spawn(n_runs):
+        S, I, R = stochastic_sir(N, I0, R0, beta, gamma, days, rng=run_rng)
+        peak = int(max(I))
+        if peak <= 5:
+            continue
+        peak_infected.append(peak)
+
+    return peak_infected
+
+def report(peak_infected, n_runs, fmt="plot", output=None):
+    """
+    Writes the peak infection statistics in the requested format
+    """
+    mean_peak = float(np.mean(peak_infected))
+    std_peak = float(np.std(peak_infected))
+
+    if fmt == "json":
+        reporting.write_json({
+            "runs": n_runs,
+            "peak_infected": peak_infected,
+            "mean": mean_peak,
+            "std": std_peak
+        }, output)
+        return
+    if fmt == "csv":
+        reporting.write_csv(["run", "peak_infected"], enumerate(peak_infected, start=1), output)
+        return
+
+    print("----- SIR Peak Infection Statistics -----")
+    print(f"Runs: {n_runs}")
+    print(f"Mean peak infected: {mean_peak:.2f}")
+    print(f"Standard deviation: {std_peak:.2f}")
+    print("-----------------------------------------")
 
-peak_infected = np.array(peak_infected)
+    reporting.plot_histogram(peak_infected, "Maximum infected in run")
 
-mean_peak = np.mean(peak_infected)
-std_peak = np.std(peak_infected)
+def run_study_from_args(args):
+    """
+    Runs the study with the parameters given on the command line
+    """
+    peak_infected = run_study(args.runs, args.nodes, args.i0, args.r0, args.beta, args.gamma,
+                              args.days, rng=args.seed)
+    report(peak_infected, args.runs, args.format, args.output)
 
-print("----- SIR Peak Infection Statistics -----")
-print(f"Runs: {N_RUNS}")
-print(f"Mean peak infected: {mean_peak:.2f}")
-print(f"Standard deviation: {std_peak:.2f}")
-print("-----------------------------------------")
+def main():
+    peak_infected = run_study(N_RUNS, N, I0, R0, beta, gamma, days, rng=SEED)
+    report(peak_infected, N_RUNS)
 
-plt.hist(peak_infected, bins=20)
-plt.xlabel("Maximum infected in run")
-plt.ylabel("Frequency")
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+File: cli.py
+Author: Aiden Telgenhof
+Description: This file is the single command line entry point for the project. It has a subcommand
+for the visualized simulation, batch runs, the baseline SIR model and parameter sweeps. Nothing
+beyond argparse is imported until a subcommand runs, and the rendering and plotting libraries are
+only imported by the subcommands and output formats that need them, so headless runs start quickly.
+"""
+import argparse
+import sys
+from reporting import FORMATS
+
+MODES = ["small_world", "fully_connected", "random"]
+SWEEP_PARAMS = {
+    "nodes": int,
+    "neighbors": int,
+    "rewire": float,
+    "steps": int,
+    "base_inf_p": float
+}
+
+def add_network_arguments(parser):
+    """
+    Adds the arguments shared by every subcommand that generates a network
+    """
+    parser.add_argument("-m", "--mode", type=str, default="small_world", choices=MODES)
+    parser.add_argument("-n", "--nodes", type=int, default=30)
+    parser.add_argument("-k", "--neighbors", type=int, default=4)
+    parser.add_argument("-p", "--rewire", type=float, default=0.1)
+    parser.add_argument("-s", "--steps", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+
+def add_batch_arguments(parser):
+    """
+    Adds the arguments shared by the subcommands that run many headless simulations
+    """
+    parser.add_argument("-r", "--runs", type=int, default=100)
+    parser.add_argument("--base_inf_p", type=float, default=0.1)
+    parser.add_argument("--store", type=str, default=None,
+                        help="directory for memory-mapped edge storage of very large networks")
+    parser.add_argument("--explicit", action="store_true",
+                        help="build every edge of fully connected networks instead of using the implicit graph")
+
+def add_output_arguments(parser, default="plot"):
+    """
+    Adds the arguments that choose how results are written
+    """
+    parser.add_argument("-f", "--format", type=str, default=default, choices=FORMATS,
+                        help="plot needs Matplotlib, json and csv do not")
+    parser.add_argument("-o", "--output", type=str, default=None,
+                        help="file for json or csv output, defaults to stdout")
+
+def add_sir_arguments(parser):
+    """
+    Adds the arguments of the baseline SIR model
+    """
+    parser.add_argument("-r", "--runs", type=int, default=200)
+    parser.add_argument("-n", "--nodes", type=int, default=300)
+    parser.add_argument("--i0", type=int, default=1, help="initially infected")
+    parser.add_argument("--r0", type=int, default=0, help="initially recovered")
+    parser.add_argument("--beta", type=float, default=0.3, help="transmission probability")
+    parser.add_argument("--gamma", type=float, default=0.1, help="recovery rate")
+    parser.add_argument("-d", "--days", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+
+def _simulate(args):
+    from main import simulate
+    simulate(args)
+
+def _batch(args):
+    from run_batch import run_batch_from_args
+    run_batch_from_args(args)
+
+def _sir(args):
+    from SIR_model import run_study_from_args
+    run_study_from_args(args)
+
+def _sweep(args):
+    from run_batch import run_sweep_from_args
+    run_sweep_from_args(args)
+
+def build_parser():
+    """
+    Builds the argument parser with one subparser per subcommand
+    """
+    parser = argparse.ArgumentParser(description="Epidemic and opinion dynamics simulator")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    simulate = subparsers.add_parser("simulate", help="run a single simulation in the PyGame visualizer")
+    add_network_arguments(simulate)
+    simulate.set_defaults(func=_simulate)
+
+    batch = subparsers.add_parser("batch", help="run many headless simulations")
+    add_network_arguments(batch)
+    add_batch_arguments(batch)
+    add_output_arguments(batch)
+    batch.set_defaults(func=_batch)
+
+    sir = subparsers.add_parser("sir", help="run the baseline stochastic SIR model")
+    add_sir_arguments(sir)
+    add_output_arguments(sir)
+    sir.set_defaults(func=_sir)
+
+    sweep = subparsers.add_parser("sweep", help="run a batch for each value of one parameter")
+    add_network_arguments(sweep)
+    add_batch_arguments(sweep)
+    add_output_arguments(sweep, default="csv")
+    sweep.add_argument("--param", type=str, required=True, choices=list(SWEEP_PARAMS))
+    sweep.add_argument("--values", type=float, nargs="+", required=True)
+    sweep.set_defaults(func=_sweep)
+
+    return parser
+
+def main(argv=None):
+    """
+    Entry point for the command line interface
+    """
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
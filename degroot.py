@@ -6,26 +6,24 @@ learning model, it is intended to be adaptable to any task environment and not j
 that this project was designed to use.
 """
 import numpy as np
+from edge_store import csr_matvec, iter_row_blocks
+from rng import as_random_source
 
 class DeGrootModel:
     """
     A class which implements DeGroot social learning for a number of agents where
     each agent has their own opinion and level of trust in other agents
     """
-    def __init__(self, num_nodes, trust_matrix=None, initial_opinions=None):
+    def __init__(self, num_nodes, trust_matrix=None, initial_opinions=None, rng=None):
         """
         Initializes the DeGroot model
         
         :param num_nodes: Number of agents in the system
         :param trust_matrix: Matrix that denotes trust an agent places in another agent
         :param initial_opinions: Initial opinion vector representing each agent's opinion
+        :param rng: RandomSource or seed used to draw opinions when none are given
         """
-        self.n = num_nodes
-
-        if initial_opinions is None:
-            self.opinions = np.random.uniform(0.0, 1.0, size=self.n)
-        else:
-            self.opinions = np.array(initial_opinions, dtype=float)
+        self._init_opinions(num_nodes, initial_opinions, rng)
 
         if trust_matrix is None:
             self.W = np.eye(self.n)
@@ -33,6 +31,18 @@ class DeGrootModel:
             self.W = np.array(trust_matrix, dtype=float)
             self._normalize_rows()
     
+    def _init_opinions(self, num_nodes, initial_opinions, rng):
+        """
+        Sets the number of agents and their opinions, opinions are drawn uniformly
+        at random when none are given
+        """
+        self.n = num_nodes
+
+        if initial_opinions is None:
+            self.opinions = as_random_source(rng).uniform(0.0, 1.0, size=self.n)
+        else:
+            self.opinions = np.array(initial_opinions, dtype=float)
+    
     def _normalize_rows(self):
         """
         Normalizes each row of the trust matrix so that their sum is 1
@@ -66,4 +76,94 @@ class DeGrootModel:
         """
         Returns a copy of the opinion vector
         """
-        return self.opinions.copy()
\ No newline at end of file
+        return self.opinions.copy()
+
+class CSRDeGrootModel(DeGrootModel):
+    """
+    A DeGroot model whose trust matrix is stored in compressed sparse row form, the trust
+    each agent places in itself is kept separately from the trust placed in its neighbors.
+    The index and weight arrays may be memory-mapped so that very large networks can be used
+    """
+    def __init__(self, num_nodes, indptr, indices, weights, self_weights, initial_opinions=None,
+                 rng=None):
+        """
+        Initializes the DeGroot model
+
+        :param num_nodes: Number of agents in the system
+        :param indptr: Row pointer array of the trust matrix
+        :param indices: Neighbor index array of the trust matrix
+        :param weights: Trust an agent places in each neighbor, normalized in place
+        :param self_weights: Trust each agent places in itself
+        :param initial_opinions: Initial opinion vector representing each agent's opinion
+        :param rng: RandomSource or seed used to draw opinions when none are given
+        """
+        self._init_opinions(num_nodes, initial_opinions, rng)
+
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.self_weights = np.asarray(self_weights, dtype=float)
+        self._normalize_rows()
+
+    def _normalize_rows(self):
+        """
+        Normalizes each row of the trust matrix so that their sum is 1
+        If a row sum is 0, it is treated as 1 to avoid division by 0
+        """
+        row_sums = csr_matvec(self.indptr, self.indices, np.ones(self.n), data=self.weights)
+        row_sums += self.self_weights
+        row_sums[row_sums == 0] = 1.0
+
+        for start, end in iter_row_blocks(self.indptr):
+            lo, hi = self.indptr[start], self.indptr[end]
+            rows = np.repeat(row_sums[start:end], np.diff(self.indptr[start:end + 1]))
+            self.weights[lo:hi] /= rows
+        self.self_weights /= row_sums
+
+    def step(self):
+        """
+        Performs one step in the DeGroot model
+        """
+        neighbor_part = csr_matvec(self.indptr, self.indices, self.opinions, data=self.weights)
+        self.opinions = self.self_weights * self.opinions + neighbor_part
+        return self.opinions
+
+
+class MeanFieldDeGrootModel(DeGrootModel):
+    """
+    A DeGroot model on a complete graph where the trust matrix is never built. The trust
+    agent i places in any other agent j is proportional to a per-agent trust value of j,
+    which makes the off-diagonal part of the matrix rank one so each step only needs
+    one weighted sum over all agents
+    """
+    def __init__(self, num_nodes, trust, self_weights, initial_opinions=None, rng=None):
+        """
+        Initializes the DeGroot model
+
+        :param num_nodes: Number of agents in the system
+        :param trust: Trust the other agents place in each agent
+        :param self_weights: Trust each agent places in itself
+        :param initial_opinions: Initial opinion vector representing each agent's opinion
+        :param rng: RandomSource or seed used to draw opinions when none are given
+        """
+        self._init_opinions(num_nodes, initial_opinions, rng)
+
+        self.trust = np.asarray(trust, dtype=float)
+        self.self_weights = np.asarray(self_weights, dtype=float)
+        self._normalize_rows()
+
+    def _normalize_rows(self):
+        """
+        Computes the sum of each row of the implicit trust matrix so that every step
+        can divide by it, if a row sum is 0 it is treated as 1 to avoid division by 0
+        """
+        self.row_sums = self.self_weights + self.trust.sum() - self.trust
+        self.row_sums[self.row_sums == 0] = 1.0
+
+    def step(self):
+        """
+        Performs one step in the DeGroot model
+        """
+        others = self.trust @ self.opinions - self.trust * self.opinions
+        self.opinions = (self.self_weights * self.opinions + others) / self.row_sums
+        return self.opinions
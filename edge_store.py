@@ -0,0 +1,227 @@
+"""
+File: edge_store.py
+Author: Aiden Telgenhof
+Description: This file contains the storage backend for graphs that are too large to be held as
+Python lists of tuples. Edges are streamed into the store in chunks, either in memory or to files
+on disk, and are then turned into a compressed sparse row (CSR) adjacency so that the environment
+and the DeGroot model can work on flat int32/float32 arrays that may be memory-mapped. Complete
+graphs are not stored at all, they are represented implicitly by the CompleteGraph class.
+"""
+import os
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+class EdgeStore:
+    """
+    Holds the edges of an undirected graph and the CSR adjacency built from them. When a
+    directory is given every large array lives in a memory-mapped file inside of it,
+    otherwise the arrays are kept in memory
+    """
+    def __init__(self, num_nodes, directory=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initializes an empty edge store
+
+        :param num_nodes: Number of nodes in the graph
+        :param directory: Folder used for the memory-mapped files, None keeps everything in memory
+        :param chunk_size: Number of edges that are processed at a time
+        """
+        self.num_nodes = num_nodes
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.num_edges = 0
+        self.finalized = False
+
+        self.edges = None
+        self.indptr = None
+        self.indices = None
+
+        self._chunks = []
+        self._edge_file = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._edge_file = open(self._path("edges"), "wb")
+
+    @classmethod
+    def from_edges(cls, edges, num_nodes, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Builds an in-memory store from a list of edges such as the one returned by
+        the network generator
+        """
+        store = cls(num_nodes, chunk_size=chunk_size)
+        store.append(edges)
+        store.finalize()
+        return store
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def allocate_array(self, name, dtype, size):
+        """
+        Creates a writable array that lives next to the rest of the store, on disk if the
+        store has a directory and in memory if it does not
+
+        :param name: Name of the backing file
+        :param dtype: Data type of the array
+        :param size: Number of entries in the array
+        """
+        if self.directory is None or size == 0:
+            return np.zeros(size, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode="w+", shape=(size,))
+
+    def append(self, edges):
+        """
+        Adds a chunk of edges to the store
+
+        :param edges: Any array-like of (u, v) pairs
+        """
+        if self.finalized:
+            raise RuntimeError("Cannot append edges to a finalized EdgeStore")
+
+        chunk = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        if self._edge_file is not None:
+            chunk.tofile(self._edge_file)
+        else:
+            self._chunks.append(chunk)
+        self.num_edges += len(chunk)
+
+    def finalize(self):
+        """
+        Stops accepting edges and builds the CSR adjacency, does nothing if it was already built
+        """
+        if self.finalized:
+            return self
+        self.finalized = True
+
+        if self._edge_file is not None:
+            self._edge_file.close()
+            self._edge_file = None
+            if self.num_edges > 0:
+                self.edges = np.memmap(self._path("edges"), dtype=np.int32, mode="r",
+                                       shape=(self.num_edges, 2))
+            else:
+                self.edges = np.zeros((0, 2), dtype=np.int32)
+        elif self._chunks:
+            self.edges = np.concatenate(self._chunks)
+        else:
+            self.edges = np.zeros((0, 2), dtype=np.int32)
+        self._chunks = []
+
+        self._build_csr()
+        return self
+
+    def iter_chunks(self):
+        """
+        Yields the edges of the store as (m, 2) arrays of at most chunk_size rows
+        """
+        for start in range(0, self.num_edges, self.chunk_size):
+            yield np.asarray(self.edges[start:start + self.chunk_size])
+
+    def degrees(self):
+        """
+        Returns the degree of every node
+        """
+        return np.diff(self.indptr)
+
+    def neighbor_sum(self, values):
+        """
+        Returns, for every node, the sum of values over its neighbors
+        """
+        return csr_matvec(self.indptr, self.indices, values)
+
+    def _build_csr(self):
+        """
+        Builds the CSR adjacency in two passes over the edges, the first one counts the
+        degree of each node and the second one scatters every edge into both of its rows
+        """
+        counts = np.zeros(self.num_nodes, dtype=np.int64)
+        for chunk in self.iter_chunks():
+            counts += np.bincount(chunk.ravel(), minlength=self.num_nodes)
+
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.indices = self.allocate_array("indices", np.int32, int(self.indptr[-1]))
+
+        fill = self.indptr[:-1].copy()
+        for chunk in self.iter_chunks():
+            src = np.concatenate((chunk[:, 0], chunk[:, 1]))
+            dst = np.concatenate((chunk[:, 1], chunk[:, 0]))
+
+            order = np.argsort(src, kind="stable")
+            src = src[order]
+            dst = dst[order]
+
+            group_start = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+            group_sizes = np.diff(np.r_[group_start, len(src)])
+            rank = np.arange(len(src)) - np.repeat(group_start, group_sizes)
+
+            self.indices[fill[src] + rank] = dst
+            fill[src[group_start]] += group_sizes
+
+        if isinstance(self.indices, np.memmap):
+            self.indices.flush()
+
+
+class CompleteGraph:
+    """
+    Implicit representation of a complete graph, none of the n(n-1)/2 edges are ever
+    materialized and every neighborhood quantity is computed from sums over all nodes
+    """
+    def __init__(self, num_nodes):
+        """
+        Initializes the complete graph
+
+        :param num_nodes: Number of nodes in the graph
+        """
+        self.num_nodes = num_nodes
+        self.num_edges = num_nodes * (num_nodes - 1) // 2
+
+    def degrees(self):
+        """
+        Returns the degree of every node
+        """
+        return np.full(self.num_nodes, self.num_nodes - 1)
+
+    def neighbor_sum(self, values):
+        """
+        Returns, for every node, the sum of values over all of the other nodes
+        """
+        values = np.asarray(values, dtype=float)
+        return values.sum() - values
+
+
+def iter_row_blocks(indptr, block_size=DEFAULT_CHUNK_SIZE):
+    """
+    Splits the rows of a CSR matrix into consecutive blocks that hold roughly
+    block_size entries each, yielding (first_row, end_row) pairs
+    """
+    n = len(indptr) - 1
+    start = 0
+    while start < n:
+        end = int(np.searchsorted(indptr, indptr[start] + block_size, side="right")) - 1
+        end = min(max(end, start + 1), n)
+        yield start, end
+        start = end
+
+
+def csr_matvec(indptr, indices, x, data=None, block_size=DEFAULT_CHUNK_SIZE):
+    """
+    Multiplies a CSR matrix with a vector one block of rows at a time so that memory-mapped
+    index and weight arrays never have to be read into memory all at once
+
+    :param indptr: Row pointer array of the CSR matrix
+    :param indices: Column index array of the CSR matrix
+    :param x: Vector to multiply with
+    :param data: Entry values of the CSR matrix, None treats every entry as 1
+    """
+    out = np.zeros(len(indptr) - 1, dtype=float)
+    for start, end in iter_row_blocks(indptr, block_size):
+        lo, hi = indptr[start], indptr[end]
+        if hi == lo:
+            continue
+        vals = x[indices[lo:hi]]
+        if data is not None:
+            vals = vals * data[lo:hi]
+        rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+        out[start:end] = np.bincount(rows, weights=vals, minlength=end - start)
+    return out
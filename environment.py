@@ -6,9 +6,10 @@ does not generate graphical networks or the DeGroot logic; however, it does simu
 in time through the environment and it updates opinions using task specific logic. This logic 
 is mainly having nodes gain more fear when they see an infected neighbor.
 """
-import random
-from degroot import DeGrootModel
 import numpy as np
+from degroot import CSRDeGrootModel, MeanFieldDeGrootModel
+from edge_store import CompleteGraph, EdgeStore, iter_row_blocks
+from rng import as_random_source
 
 VACCINATION_PROTECTION = 0.95
 BASE_VAX_RATE = 0.05
@@ -20,158 +21,189 @@ class Environment:
     Simulation environment that contains everything needed to show virus spread
     and opinion dynamics from DeGroot model
     """
-    def __init__(self, edges, positions, base_infection_p=0.1):
+    def __init__(self, edges, positions, base_infection_p=0.1, rng=None):
         """
         Initializes the environment
         
-        :param edges: list of edges that represent the graph
-        :param positions: positions of each node from network generator passed to visualizer
+        :param edges: list of edges that represent the graph, an EdgeStore for large graphs
+        or a CompleteGraph for fully connected graphs that are never materialized
+        :param positions: positions of each node from network generator passed to visualizer,
+        may be None when edges is an EdgeStore or a CompleteGraph
         :param base_infection_p: base probability of infection transmission
+        :param rng: RandomSource or seed that drives every random event in the environment
         """
+        self.rng = as_random_source(rng)
         self.edges = edges
         self.positions = positions
         self.base_p = base_infection_p
 
-        self.num_nodes = len(positions)
-        self.nodes = []
-        self.adj = {i: [] for i in range(self.num_nodes)}
+        if isinstance(edges, CompleteGraph):
+            self.store = edges
+            self.num_nodes = edges.num_nodes
+        elif isinstance(edges, EdgeStore):
+            self.store = edges.finalize()
+            self.num_nodes = edges.num_nodes
+        else:
+            self.num_nodes = len(positions)
+            self.store = EdgeStore.from_edges(edges, self.num_nodes)
 
-        self._build_graph()
         self._init_nodes()
 
-        self.trust_matrix = self._create_trust_matrix()
-        initial_opinions = [n["opinion_risk"] for n in self.nodes]
-        self.degroot = DeGrootModel(self.num_nodes, trust_matrix=self.trust_matrix, initial_opinions=initial_opinions)
+        self.trust_weights, self.self_trust = self._create_trust_matrix()
+        if isinstance(self.store, CompleteGraph):
+            self.degroot = MeanFieldDeGrootModel(self.num_nodes, self.trust_weights, self.self_trust,
+                                                 initial_opinions=self.opinion_risk, rng=self.rng)
+        else:
+            self.degroot = CSRDeGrootModel(self.num_nodes, self.store.indptr, self.store.indices,
+                                           self.trust_weights, self.self_trust,
+                                           initial_opinions=self.opinion_risk, rng=self.rng)
+
+    @property
+    def nodes(self):
+        """
+        Snapshot of every node as a dictionary, this is only meant for small graphs
+        such as the ones drawn by the visualizer
+        """
+        return [
+            {
+                "innate_risk": float(self.innate_risk[i]),
+                "opinion_risk": float(self.opinion_risk[i]),
+                "infected": bool(self.infected[i]),
+                "vaccinated": bool(self.vaccinated[i])
+            }
+            for i in range(self.num_nodes)
+        ]
 
     def _init_nodes(self):
         """
         Initializes all nodes in network with random risk values, low percieved risk
         Randomly selects patient zero
         """
-        for _ in range(self.num_nodes):
-            node = {
-                "innate_risk": random.uniform(0.2, 0.8),
-                "opinion_risk": random.uniform(0.0, 0.1),
-                "infected": False,
-                "vaccinated": False
-            }
-            self.nodes.append(node)
+        self.innate_risk = self.rng.uniform(0.2, 0.8, size=self.num_nodes)
+        self.opinion_risk = self.rng.uniform(0.0, 0.1, size=self.num_nodes)
+        self.infected = np.zeros(self.num_nodes, dtype=bool)
+        self.vaccinated = np.zeros(self.num_nodes, dtype=bool)
 
-        patient_zero = random.randint(0, self.num_nodes - 1)
-        self.nodes[patient_zero]["infected"] = True
+        patient_zero = self.rng.integers(0, self.num_nodes)
+        self.infected[patient_zero] = True
 
     def step(self):
         """
-        Performs all necessary operations for one step through the environment simulation
+        Performs all necessary operations for one step through the environment simulation,
+        returns the source and destination arrays of the edges that transmitted the infection
         """
         self.update_percieved_risk_from_infections()
-        self.degroot.opinions = np.array([n["opinion_risk"] for n in self.nodes], dtype=float)
-        updated_opinions = self.degroot.step()
-
-        for i in range(self.num_nodes):
-            self.nodes[i]["opinion_risk"] = float(updated_opinions[i])
+        self.degroot.opinions = self.opinion_risk.copy()
+        self.opinion_risk = self.degroot.step()
 
         self._vaccinate()
 
-        new_infections = []
-        infected_edges = []
+        if isinstance(self.store, CompleteGraph):
+            new_infections, infected_edges = self._spread_complete()
+        else:
+            new_infections, infected_edges = self._spread_edges()
 
-        for (u, v) in self.edges:
-            u_inf = self.nodes[u]["infected"]
-            v_inf = self.nodes[v]["infected"]
+        self.infected |= new_infections
 
-            if u_inf and not v_inf:
-                p = self._transmission_p(u, v)
-                if random.random() < p:
-                    new_infections.append(v)
-                    infected_edges.append((u, v))
+        val = np.nan_to_num(np.real(self.opinion_risk), nan=0.0)
+        self.opinion_risk = np.clip(val, 0.0, 1.0)
 
-            if v_inf and not u_inf:
-                p = self._transmission_p(v, u)
-                if random.random() < p:
-                    new_infections.append(u)
-                    infected_edges.append((v, u))
+        return infected_edges
 
-        for i in new_infections:
-            self.nodes[i]["infected"] = True
+    def _spread_edges(self):
+        """
+        Gives every edge between an infected and an uninfected node a chance to transmit
+        the infection, returns the newly infected nodes and the edges they were infected through
+        """
+        new_infections = np.zeros(self.num_nodes, dtype=bool)
+        infected_src = []
+        infected_dst = []
 
-        for node in self.nodes:
-            val = node["opinion_risk"]
+        for chunk in self.store.iter_chunks():
+            u = chunk[:, 0]
+            v = chunk[:, 1]
+            u_inf = self.infected[u]
+            v_inf = self.infected[v]
 
-            if isinstance(val, complex):
-                val = val.real
+            for src, dst, mask in ((u, v, u_inf & ~v_inf), (v, u, v_inf & ~u_inf)):
+                src = src[mask]
+                dst = dst[mask]
+                p = self._transmission_p(src, dst)
+                hit = self.rng.random(len(dst)) < p
+                new_infections[dst[hit]] = True
+                infected_src.append(src[hit])
+                infected_dst.append(dst[hit])
 
-            if np.isnan(val):
-                val = 0.0
+        if not infected_src:
+            return new_infections, (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32))
+        return new_infections, (np.concatenate(infected_src), np.concatenate(infected_dst))
 
-            val = max(0.0, min(1.0, float(val)))
+    def _spread_complete(self):
+        """
+        Spreads the infection on a complete graph without going through the edges. Every
+        uninfected node is exposed to all infected nodes, so it escapes infection with probability
+        (1 - p)^I where I is the number of infected nodes. Each newly infected node is paired with
+        a random infected node as the source of its infection
+        """
+        sources = np.flatnonzero(self.infected)
+        p = self._transmission_p(None, np.arange(self.num_nodes))
+        p_infection = -np.expm1(len(sources) * np.log1p(-p))
 
-            node["opinion_risk"] = val
+        hit = ~self.infected & (self.rng.random(self.num_nodes) < p_infection)
+        dst = np.flatnonzero(hit)
+        src = self.rng.choice(sources, size=len(dst))
 
-        return infected_edges
+        return hit, (src, dst)
     
     def _transmission_p(self, src, dst):
         """
-        Calculates the probability of a transmission occuring between two nodes
+        Calculates the probability of a transmission occuring between two nodes,
+        works on single nodes as well as on arrays of nodes
 
         :param src: infected source node
         :param dst: uninfected destination node
         """
-        node = self.nodes[dst]
-        risk = node["innate_risk"]
-        if node["vaccinated"]:
-            risk *= (1 - VACCINATION_PROTECTION)
+        risk = self.innate_risk[dst]
+        risk = np.where(self.vaccinated[dst], risk * (1 - VACCINATION_PROTECTION), risk)
         return self.base_p * risk
     
-    def _build_graph(self):
-        """
-        Creates adjacency lists for all nodes so that a graph can be built from it
-        """
-        for u, v in self.edges:
-            self.adj[u].append(v)
-            self.adj[v].append(u)
-    
     def _create_trust_matrix(self):
         """
-        Randomly generates a trust matrix for DeGroot model to use
+        Randomly generates a trust matrix for DeGroot model to use, the trust in
+        neighbors is laid out like the CSR adjacency of the edge store. On a complete
+        graph each node instead gets a single trust value shared by all of its neighbors
         """
-        W = np.zeros((self.num_nodes, self.num_nodes))
+        if isinstance(self.store, CompleteGraph):
+            trust = self.rng.uniform(0.1, 1.0, size=self.num_nodes)
+            self_trust = self.rng.uniform(0.2, 0.8, size=self.num_nodes)
+            return trust, self_trust
 
-        for i in range(self.num_nodes):
-            neighbors = self.adj[i]
-            if not neighbors:
-                W[i, i] = 1.0
-                continue
-            
-            trust_vals = np.random.uniform(0.1, 1.0, size=len(neighbors))
+        indptr = self.store.indptr
+        weights = self.store.allocate_array("trust", np.float32, len(self.store.indices))
 
-            for t, nbr in zip(trust_vals, neighbors):
-                W[i, nbr] = t
+        for start, end in iter_row_blocks(indptr):
+            lo, hi = indptr[start], indptr[end]
+            weights[lo:hi] = self.rng.uniform(0.1, 1.0, size=hi - lo)
 
-            W[i, i] = np.random.uniform(0.2, 0.8)
+        self_trust = self.rng.uniform(0.2, 0.8, size=self.num_nodes)
+        self_trust[self.store.degrees() == 0] = 1.0
 
-        return W
+        return weights, self_trust
         
     def _vaccinate(self):
         """
         Gives chance for unvaccinated nodes to vaccinate every step
         """
-        for node in self.nodes:
-            if not node["vaccinated"]:
-                p_vax = BASE_VAX_RATE * node["opinion_risk"]
-                if random.random() < p_vax:
-                    node["vaccinated"] = True
+        p_vax = BASE_VAX_RATE * self.opinion_risk
+        self.vaccinated |= self.rng.random(self.num_nodes) < p_vax
 
     def update_percieved_risk_from_infections(self):
         """
         Updates the percieved risk opinions within the DeGroot model over time so that
         environmental factors can affect opinion as well as other opinions.
         """
-        for i in range(self.num_nodes):
-            infected_neighbors = sum(self.nodes[n]["infected"] for n in self.adj[i])
-            if infected_neighbors == 0:
-                self.nodes[i]["opinion_risk"] *= OPINION_DECAY
-            else:
-                increase = OPINION_INCREASE_PER_NEIGHBOR * infected_neighbors
-                self.nodes[i]["opinion_risk"] += increase
-            self.nodes[i]["opinion_risk"] = max(0.0, min(1.0, self.nodes[i]["opinion_risk"]))
\ No newline at end of file
+        infected_neighbors = self.store.neighbor_sum(self.infected.astype(float))
+        self.opinion_risk = np.where(infected_neighbors == 0,
+                                     self.opinion_risk * OPINION_DECAY,
+                                     self.opinion_risk + OPINION_INCREASE_PER_NEIGHBOR * infected_neighbors)
+        self.opinion_risk = np.clip(self.opinion_risk, 0.0, 1.0)
\ No newline at end of file
@@ -5,35 +5,40 @@ Description: This file serves as the primary entrypoint for the simulator progra
 input as well as creating all of the proper initialization steps to get a simulation running.
 """
 import argparse
-from network_generator import NetworkGenerator
-from environment import Environment
-from visualizer import Visualizer
+from cli import add_network_arguments
 
-def main():
+def simulate(args):
     """
-    Entry point for the main simulator program
+    Generates the network and environment and runs them in the visualizer
     """
-    parser = argparse.ArgumentParser()
+    from network_generator import NetworkGenerator
+    from environment import Environment
+    from rng import run_streams
+    from visualizer import Visualizer
 
-    parser.add_argument("-m", "--mode", type=str, default="small_world",
-                        choices=["small_world", "fully_connected", "random"])
-    parser.add_argument("-n", "--nodes", type=int, default=30)
-    parser.add_argument("-k", "--neighbors", type=int, default=4)
-    parser.add_argument("-p", "--rewire", type=float, default=0.1)
-    parser.add_argument("-s", "--steps", type=int, default=30)
-
-    args = parser.parse_args()
+    gen_rng, env_rng = run_streams(args.seed)
 
     print("Generating network...")
-    gen = NetworkGenerator(args.nodes, mode=args.mode, k=args.neighbors, rewire_p=args.rewire)
+    gen = NetworkGenerator(args.nodes, mode=args.mode, k=args.neighbors, rewire_p=args.rewire,
+                           rng=gen_rng)
     edges, positions = gen.generate()
 
     print("Creating environment...")
-    env = Environment(edges, positions)
+    env = Environment(edges, positions, rng=env_rng)
 
     print("Starting visualization...")
     vis = Visualizer(env, positions, edges)
     vis.run_simulation(steps=args.steps)
 
+def main():
+    """
+    Entry point for the main simulator program
+    """
+    parser = argparse.ArgumentParser()
+    add_network_arguments(parser)
+
+    args = parser.parse_args()
+    simulate(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,15 +6,17 @@ designed to be adaptable to any task which requires a graphical network to be ge
 contains logic to create positions for each node so that they can easily be visualized within a 
 PyGame window, but it should also work with any visualizer that uses PyGame-like coordinates.
 """
-import random
 import math
+import numpy as np
+from edge_store import DEFAULT_CHUNK_SIZE
+from rng import as_random_source
 
 class NetworkGenerator:
     """
     Generates different types of networks and their positions so that
     the visualizer can create a proper representation of the graph
     """
-    def __init__(self, n, mode="small_world", k=4, rewire_p=0.1):
+    def __init__(self, n, mode="small_world", k=4, rewire_p=0.1, rng=None):
         """
         Initializes the network generator
     
@@ -23,11 +25,13 @@ class NetworkGenerator:
         :param k: for Small world graphs, number of neighbors for each node
         :param rewire_p: probability in small world graph for nodes to rewire connection
         to further away nodes to make graph traversal faster
+        :param rng: RandomSource or seed used for every random choice made by the generator
         """
         self.n = n
         self.mode = mode
         self.k = k
         self.rewire_p = rewire_p
+        self.rng = as_random_source(rng)
 
     def generate(self):
         """
@@ -42,15 +46,103 @@ class NetworkGenerator:
         else:
             raise ValueError(f"Unknown mode {self.mode}")
     
-    def _generate_fully_connected(self):
+    def generate_to_store(self, store):
         """
-        Generates a fully connected network
+        Streams the edges of the selected mode into an EdgeStore one chunk at a time.
+        No positions are generated since graphs this large are never drawn
+
+        :param store: EdgeStore that receives the edges, it is finalized before returning
         """
-        edges = []
+        if self.mode == "fully_connected":
+            chunks = self._iter_fully_connected(store.chunk_size)
+        elif self.mode == "small_world":
+            chunks = self._iter_small_world(store.chunk_size)
+        elif self.mode == "random":
+            chunks = self._iter_random(store.chunk_size)
+        else:
+            raise ValueError(f"Unknown mode {self.mode}")
+
+        for chunk in chunks:
+            store.append(chunk)
+        return store.finalize()
+
+    def _iter_rows(self, row_neighbors, chunk_size):
+        """
+        Collects the edges from each node to the higher numbered nodes returned by
+        row_neighbors into chunks of at least chunk_size edges
+        """
+        buffer = []
+        size = 0
         for i in range(self.n):
-            for j in range(i+1, self.n):
-                edges.append((i, j))
+            neighbors = row_neighbors(i)
+            if len(neighbors) == 0:
+                continue
+            buffer.append(np.column_stack((np.full(len(neighbors), i), neighbors)))
+            size += len(neighbors)
+            if size >= chunk_size:
+                yield np.concatenate(buffer).astype(np.int32)
+                buffer = []
+                size = 0
+        if buffer:
+            yield np.concatenate(buffer).astype(np.int32)
+
+    def _iter_fully_connected(self, chunk_size):
+        """
+        Streams the edges of a fully connected network
+        """
+        return self._iter_rows(lambda i: np.arange(i + 1, self.n), chunk_size)
+
+    def _iter_random(self, chunk_size, p=0.1):
+        """
+        Streams the edges of a random network
+
+        :param p: the probability of an edge being created between two nodes
+        """
+        def row_neighbors(i):
+            return i + 1 + np.flatnonzero(self.rng.random(self.n - i - 1) < p)
+        return self._iter_rows(row_neighbors, chunk_size)
+
+    def _iter_small_world(self, chunk_size):
+        """
+        Streams the edges of a small world graph. Every edge uses exactly two uniform
+        draws, one for whether it is rewired and one for its new neighbor, so the graph
+        does not depend on the chunk size
+        """
+        deg = self.k
+        if deg % 2 == 1:
+            deg += 1
+        half = deg // 2
+        offsets = np.arange(1, half + 1)
+        block = max(1, chunk_size // half)
+
+        for start in range(0, self.n, block):
+            u = np.repeat(np.arange(start, min(start + block, self.n)), half)
+            v = (u + np.tile(offsets, len(u) // half)) % self.n
+
+            draws = self.rng.random(2 * len(u)).reshape(-1, 2)
+            rewire = draws[:, 0] < self.rewire_p
+            new_v = (draws[rewire, 1] * (self.n - 1)).astype(np.int64)
+            new_v += new_v >= u[rewire]
+            v[rewire] = new_v
+
+            yield np.column_stack((u, v)).astype(np.int32)
+    
+    def _collect(self, chunks):
+        """
+        Turns streamed edge chunks into the list of edges used by the visualizer, so that
+        both ways of generating a network make the same random draws in the same order
+        """
+        edges = []
+        for chunk in chunks:
+            edges.extend(tuple(edge) for edge in chunk.tolist())
         self.edges = edges
+        return edges
+
+    def _generate_fully_connected(self):
+        """
+        Generates a fully connected network
+        """
+        edges = self._collect(self._iter_fully_connected(DEFAULT_CHUNK_SIZE))
         positions = self._circle_layout()
         return edges, positions
     
@@ -60,12 +152,7 @@ class NetworkGenerator:
 
         :param p: the probability of an edge being created between two nodes
         """
-        edges = []
-        for i in range(self.n):
-            for j in range(i+1, self.n):
-                if random.random() < p:
-                    edges.append((i, j))
-        self.edges = edges
+        edges = self._collect(self._iter_random(DEFAULT_CHUNK_SIZE, p=p))
         positions = self._spring_layout()
         return edges, positions
     
@@ -73,28 +160,9 @@ class NetworkGenerator:
         """
         Generates a small world graph
         """
-        edges = []
-
-        deg = self.k
-        if deg % 2 == 1:
-            deg += 1
-
-        for i in range(self.n):
-            for j in range(1, deg//2 + 1):
-                neighbor = (i + j) % self.n
-                edges.append((i, neighbor))
-
-        new_edges = []
-        for (u, v) in edges:
-            if random.random() < self.rewire_p:
-                new_v = random.choice([x for x in range(self.n) if x != u])
-                new_edges.append((u, new_v))
-            else:
-                new_edges.append((u, v))
-
-        self.edges = edges
+        edges = self._collect(self._iter_small_world(DEFAULT_CHUNK_SIZE))
         positions = self._spring_layout()
-        return new_edges, positions
+        return edges, positions
     
     def _spring_layout(self, iterations=200, k=40, repulsion=50000):
         """
@@ -103,7 +171,7 @@ class NetworkGenerator:
         where neighbor points are closer together than they are with other points.
         """
         positions = {
-            i: [random.uniform(50, 750), random.uniform(50, 550)] for i in range(self.n)
+            i: [self.rng.uniform(50, 750), self.rng.uniform(50, 550)] for i in range(self.n)
         }
 
         for _ in range(iterations):
@@ -150,8 +218,8 @@ class NetworkGenerator:
                 positions[i][1] += 0.03 * forces[i][1]
 
                 if math.isnan(positions[i][0]) or math.isnan(positions[i][1]):
-                    positions[i][0] = random.uniform(100, 700)
-                    positions[i][1] = random.uniform(100, 500)
+                    positions[i][0] = self.rng.uniform(100, 700)
+                    positions[i][1] = self.rng.uniform(100, 500)
 
                 positions[i][0] = max(20, min(780, positions[i][0]))
                 positions[i][1] = max(20, min(580, positions[i][1]))
@@ -0,0 +1,74 @@
+"""
+File: reporting.py
+Author: Aiden Telgenhof
+Description: This file contains the logic for writing out the results of batch runs. Results can be
+written as JSON or CSV without any plotting library, Matplotlib is only imported when a plot is
+actually requested so that headless runs start quickly.
+"""
+import csv
+import json
+import sys
+
+FORMATS = ["plot", "json", "csv"]
+
+def _open_output(output):
+    """
+    Returns the file to write to and whether it has to be closed afterwards
+    """
+    if output is None or output == "-":
+        return sys.stdout, False
+    return open(output, "w", newline=""), True
+
+def write_json(data, output=None):
+    """
+    Writes data as JSON
+
+    :param data: Any JSON serializable object
+    :param output: Path of the output file, None or "-" writes to stdout
+    """
+    f, close = _open_output(output)
+    try:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    finally:
+        if close:
+            f.close()
+
+def write_csv(header, rows, output=None):
+    """
+    Writes rows as CSV
+
+    :param header: Column names
+    :param rows: Iterable of rows with one value per column
+    :param output: Path of the output file, None or "-" writes to stdout
+    """
+    f, close = _open_output(output)
+    try:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    finally:
+        if close:
+            f.close()
+
+def plot_histogram(values, xlabel, bins=20):
+    """
+    Shows a histogram of the values using Matplotlib
+    """
+    import matplotlib.pyplot as plt
+
+    plt.hist(values, bins=bins)
+    plt.xlabel(xlabel)
+    plt.ylabel("Frequency")
+    plt.show()
+
+def plot_errorbars(xs, means, stds, xlabel, ylabel):
+    """
+    Shows the mean and standard deviation of a result for each value of a parameter
+    """
+    import matplotlib.pyplot as plt
+
+    plt.errorbar(xs, means, yerr=stds, marker="o", capsize=4)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.show()
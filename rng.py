@@ -0,0 +1,117 @@
+"""
+File: rng.py
+Author: Aiden Telgenhof
+Description: This file contains the random number service shared by every part of the simulator.
+It wraps a NumPy Generator so that a single seed reproduces a whole run, hands out independent
+child streams for separate components, and serves uniform numbers from pre-drawn blocks so that
+loops asking for one number at a time do not call into NumPy for every draw.
+"""
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+class RandomSource:
+    """
+    Seedable source of random numbers based on a NumPy Generator
+    """
+    def __init__(self, seed=None, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Initializes the random source
+
+        :param seed: Integer seed or SeedSequence, None draws fresh entropy from the system
+        :param block_size: Number of uniform numbers that are drawn at a time
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_seq = seed
+        else:
+            self.seed_seq = np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_seq))
+        self.block_size = block_size
+
+        self._block = np.empty(0)
+        self._pos = 0
+
+    def spawn(self, n):
+        """
+        Creates n independent child streams, the children only depend on the seed
+        of this source and not on how many numbers were already drawn from it
+        """
+        return [RandomSource(s, self.block_size) for s in self.seed_seq.spawn(n)]
+
+    def _refill(self):
+        self._block = self.generator.random(self.block_size)
+        self._pos = 0
+
+    def random(self, size=None):
+        """
+        Returns uniform numbers in [0, 1) taken from the pre-drawn block
+
+        :param size: Number of values to return, None returns a single float
+        """
+        if size is None:
+            if self._pos >= len(self._block):
+                self._refill()
+            value = self._block[self._pos]
+            self._pos += 1
+            return float(value)
+
+        out = np.empty(size)
+        taken = min(size, len(self._block) - self._pos)
+        out[:taken] = self._block[self._pos:self._pos + taken]
+        self._pos += taken
+
+        remaining = size - taken
+        if remaining >= self.block_size:
+            out[taken:] = self.generator.random(remaining)
+        elif remaining > 0:
+            self._refill()
+            out[taken:] = self._block[:remaining]
+            self._pos = remaining
+        return out
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        """
+        Returns uniform numbers in [low, high)
+        """
+        return low + (high - low) * self.random(size)
+
+    def integers(self, low, high=None, size=None):
+        """
+        Returns random integers in [low, high)
+        """
+        return self.generator.integers(low, high, size=size)
+
+    def choice(self, a, size=None):
+        """
+        Returns random elements of a
+        """
+        return self.generator.choice(a, size=size)
+
+    def binomial(self, n, p, size=None):
+        """
+        Returns binomially distributed numbers
+        """
+        return self.generator.binomial(n, p, size=size)
+
+
+def as_random_source(rng):
+    """
+    Turns None, an integer seed or an existing RandomSource into a RandomSource
+    """
+    if isinstance(rng, RandomSource):
+        return rng
+    return RandomSource(rng)
+
+
+def run_streams(seed, run_index=0):
+    """
+    Returns the (network generator, environment) streams of one simulation run. Every
+    entry point uses this, so run i of a batch with a given seed is the same simulation
+    as run i of a sweep value or the visualized run when run_index is 0
+
+    :param seed: Integer seed, None draws fresh entropy from the system
+    :param run_index: Index of the run within a batch
+    """
+    run_seq = np.random.SeedSequence(seed, spawn_key=(run_index,))
+    gen_rng, env_rng = RandomSource(run_seq).spawn(2)
+    return gen_rng, env_rng
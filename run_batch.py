@@ -6,63 +6,126 @@ without the visualizer so that the simulations could run faster. This was useful
 for finding the average number of infected in the simulator.
 """
 import argparse
+import sys
 from network_generator import NetworkGenerator
 from environment import Environment
+from edge_store import CompleteGraph, EdgeStore
+from rng import run_streams
+from cli import SWEEP_PARAMS, add_batch_arguments, add_network_arguments, add_output_arguments
+import reporting
 import numpy as np
-import matplotlib.pyplot as plt
 
-def run_single_sim(num_nodes, mode, k, rewire_p, steps, base_infection_p):
-    gen = NetworkGenerator(num_nodes, mode=mode, k=k, rewire_p=rewire_p)
-    edges, positions = gen.generate()
+def run_single_sim(num_nodes, mode, k, rewire_p, steps, base_infection_p, store_dir=None,
+                   explicit=False, seed=None, run_index=0):
+    gen_rng, env_rng = run_streams(seed, run_index)
+    gen = NetworkGenerator(num_nodes, mode=mode, k=k, rewire_p=rewire_p, rng=gen_rng)
+    if mode == "fully_connected" and not explicit:
+        edges = CompleteGraph(num_nodes)
+        positions = None
+    elif store_dir is None:
+        edges, positions = gen.generate()
+    else:
+        edges = gen.generate_to_store(EdgeStore(num_nodes, directory=store_dir))
+        positions = None
 
-    env = Environment(edges, positions, base_infection_p=base_infection_p)
+    env = Environment(edges, positions, base_infection_p=base_infection_p, rng=env_rng)
 
     infected_counts = []
 
     for _ in range(steps):
-        infected_counts.append(sum(n["infected"] for n in env.nodes))
+        infected_counts.append(int(env.infected.sum()))
         env.step()
 
     return max(infected_counts)
 
 
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-m", "--mode", type=str, default="small_world",
-                        choices=["small_world", "fully_connected", "random"])
-    parser.add_argument("-n", "--nodes", type=int, default=30)
-    parser.add_argument("-k", "--neighbors", type=int, default=4)
-    parser.add_argument("-p", "--rewire", type=float, default=0.1)
-    parser.add_argument("-s", "--steps", type=int, default=30)
-    parser.add_argument("-r", "--runs", type=int, default=100)
-    parser.add_argument("--base_inf_p", type=float, default=0.1)
-
-    args = parser.parse_args()
+def run_batch(args, log=sys.stdout):
+    """
+    Runs args.runs simulations and returns the maximum number of infected in each of them
 
+    :param args: Parsed network and batch arguments
+    :param log: File that progress messages are written to
+    """
     max_infected_list = []
 
     for i in range(args.runs):
-        print(f"Run {i+1}/{args.runs}")
+        print(f"Run {i+1}/{args.runs}", file=log)
         max_inf = run_single_sim(
             num_nodes=args.nodes,
             mode=args.mode,
             k=args.neighbors,
             rewire_p=args.rewire,
             steps=args.steps,
-            base_infection_p=args.base_inf_p
+            base_infection_p=args.base_inf_p,
+            store_dir=args.store,
+            explicit=args.explicit,
+            seed=args.seed,
+            run_index=i
         )
         max_infected_list.append(max_inf)
 
-    print("\n=== Results ===")
-    print("Max infected across runs:")
-    print(max_infected_list)
-    print(f"\nMean max infected: {np.mean(max_infected_list):.2f}")
-    print(f"Std dev: {np.std(max_infected_list):.2f}")
+    return max_infected_list
+
+
+def run_batch_from_args(args):
+    """
+    Runs a batch and writes the results in the requested format
+    """
+    log = sys.stdout if args.format == "plot" else sys.stderr
+    max_infected_list = run_batch(args, log=log)
+
+    if args.format == "json":
+        reporting.write_json({
+            "runs": args.runs,
+            "max_infected": max_infected_list,
+            "mean": float(np.mean(max_infected_list)),
+            "std": float(np.std(max_infected_list))
+        }, args.output)
+    elif args.format == "csv":
+        reporting.write_csv(["run", "max_infected"], enumerate(max_infected_list, start=1), args.output)
+    else:
+        print("\n=== Results ===")
+        print("Max infected across runs:")
+        print(max_infected_list)
+        print(f"\nMean max infected: {np.mean(max_infected_list):.2f}")
+        print(f"Std dev: {np.std(max_infected_list):.2f}")
+
+        reporting.plot_histogram(max_infected_list, "Maximum infected in run")
+
 
-    plt.hist(max_infected_list, bins=20)
-    plt.xlabel("Maximum infected in run")
-    plt.ylabel("Frequency")
-    plt.show()
+def run_sweep_from_args(args):
+    """
+    Runs a batch for every value of the swept parameter and writes the mean and
+    standard deviation of the maximum number of infected for each value
+    """
+    cast = SWEEP_PARAMS[args.param]
+    values = [cast(v) for v in args.values]
+
+    rows = []
+    for value in values:
+        print(f"{args.param} = {value}", file=sys.stderr)
+        setattr(args, args.param, value)
+        max_infected_list = run_batch(args, log=sys.stderr)
+        rows.append([value, args.runs, float(np.mean(max_infected_list)), float(np.std(max_infected_list))])
+
+    header = [args.param, "runs", "mean_max_infected", "std_max_infected"]
+    if args.format == "json":
+        reporting.write_json([dict(zip(header, row)) for row in rows], args.output)
+    elif args.format == "csv":
+        reporting.write_csv(header, rows, args.output)
+    else:
+        reporting.plot_errorbars([row[0] for row in rows], [row[2] for row in rows],
+                                 [row[3] for row in rows], args.param, "Mean maximum infected")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_network_arguments(parser)
+    add_batch_arguments(parser)
+    add_output_arguments(parser)
+
+    args = parser.parse_args()
+    run_batch_from_args(args)
 
 if __name__ == "__main__":
     main()
@@ -80,7 +80,8 @@ class Visualizer:
                 if event.type == pygame.QUIT:
                     running = False
 
-            infected_edges = self.env.step()
+            src, dst = self.env.step()
+            infected_edges = set(zip(src.tolist(), dst.tolist()))
 
             self.draw_frame(infected_edges, timestep=t)
             pygame.display.flip()